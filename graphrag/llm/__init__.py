@@ -3,6 +3,8 @@
 
 """The Datashaper OpenAI Utilities package."""
 
+from typing import TYPE_CHECKING
+
 from .base import BaseLLM, CachingLLM, RateLimitingLLM
 from .errors import RetriesExhaustedError
 from .limiting import (
@@ -15,7 +17,6 @@ from .limiting import (
 from .mock import MockChatLLM, MockCompletionLLM
 from .claude import (
     ClaudeChatLLM,
-    ClaudeClientTypes,
     ClaudeCompletionLLM,
     ClaudeConfiguration,
     create_claude_chat_llm,
@@ -52,6 +53,20 @@ from .types import (
     OnCacheActionFn,
 )
 
+if TYPE_CHECKING:
+    from .claude import ClaudeClientTypes
+
+
+def __getattr__(name: str):
+    """Re-export ClaudeClientTypes lazily - resolving it imports anthropic."""
+    if name == "ClaudeClientTypes":
+        from . import claude
+
+        return claude.ClaudeClientTypes
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
+
+
 __all__ = [
     # LLM Types
     "LLM",
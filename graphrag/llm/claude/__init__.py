@@ -2,6 +2,8 @@
 
 """Claude LLM implementations."""
 
+from typing import TYPE_CHECKING
+
 from .create_claude_client import create_claude_client
 from .factories import (
     create_claude_chat_llm,
@@ -10,7 +12,20 @@ from .factories import (
 from .claude_chat_llm import ClaudeChatLLM
 from .claude_completion_llm import ClaudeCompletionLLM
 from .claude_configuration import ClaudeConfiguration
-from .types import ClaudeClientTypes
+
+if TYPE_CHECKING:
+    from .types import ClaudeClientTypes
+
+
+def __getattr__(name: str):
+    """Re-export ClaudeClientTypes lazily - resolving it imports anthropic."""
+    if name == "ClaudeClientTypes":
+        from . import types
+
+        return types.ClaudeClientTypes
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
+
 
 __all__ = [
     "ClaudeChatLLM",
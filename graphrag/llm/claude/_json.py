@@ -2,69 +2,228 @@
 
 import json
 import re
+from typing import Any
 
 """JSON cleaning and formatting utilities."""
 
-def clean_up_json(json_str: str):
-    """Clean up json string."""
-    json_str = (
-        json_str.replace("\\n", "")
-        .replace("\n", "")
-        .replace("\r", "")
-        .replace('"[{', "[{")
-        .replace('}]"', "}]")
-        .replace("\\", "")
-        .strip()
-    )
+try:
+    import orjson
+
+    def _loads(json_str: str) -> Any:
+        return orjson.loads(json_str)
+
+    def _dumps(json_obj: Any) -> str:
+        return orjson.dumps(json_obj).decode()
+
+except ImportError:
+    # orjson (C, several times faster than stdlib) is optional.
+    _loads = json.loads
+    _dumps = json.dumps
+
+# Compiled once so cleanup is a single pass over the string instead of one
+# full scan + allocation per replacement.
+_CLEANUP = re.compile(r'\\n|[\n\r\\]|"\[\{|\}\]"')
+_CLEANUP_REPLACEMENTS = {'"[{': "[{", '}]"': "}]"}
+_FENCE = re.compile(r"^(?:```json|json)|```$")
+
+
+def _cleanup_replace(match: re.Match) -> str:
+    return _CLEANUP_REPLACEMENTS.get(match.group(0), "")
+
+
+def parse_or_repair(json_str: str) -> tuple[str, Any | None]:
+    """Clean up raw model output and parse it as JSON in one pass.
+
+    Returns the cleaned string together with the parsed object (None when
+    unparseable) so callers don't have to re-parse the string they get back.
+    """
+    json_str = _CLEANUP.sub(_cleanup_replace, json_str).strip()
 
     # Remove JSON Markdown Frame
-    if json_str.startswith("```json"):
-        json_str = json_str[len("```json") :]
-    if json_str.startswith("json"):
-        json_str = json_str[len("json") :]
-    if json_str.endswith("```"):
-        json_str = json_str[: len(json_str) - len("```")]
+    json_str = _FENCE.sub("", json_str)
 
     try:
-        json.loads(json_str)
-        return json_str
+        return json_str, _loads(json_str)
     except json.JSONDecodeError:
         json_obj = extract_json_object(json_str)
         if json_obj is not None:
-            return json.dumps(json_obj)
+            return _dumps(json_obj), json_obj
+
+    return json_str, None
+
+
+def clean_up_json(json_str: str):
+    """Clean up json string."""
+    return parse_or_repair(json_str)[0]
 
-    return json_str
+
+_MISSING_COMMA = re.compile(r'}\s*{')
+
+
+def _escape_inner_quotes(json_str: str) -> str:
+    """Escape unescaped quotes inside `: "..."` string values.
+
+    Single linear walk tracking whether we are inside a value; replaces the
+    old variable-width-lookbehind regex whose per-match Python callback made
+    the repair super-linear on quote-heavy output. A quote ends the value
+    only when followed by a structural character (or end of input); already
+    escaped quotes are passed through untouched.
+    """
+    out: list[str] = []
+    in_value = False
+    i = 0
+    n = len(json_str)
+    while i < n:
+        ch = json_str[i]
+        if not in_value:
+            out.append(ch)
+            if ch == ":" and json_str.startswith(' "', i + 1):
+                out.append(' "')
+                in_value = True
+                i += 2
+        elif ch == "\\":
+            out.append(json_str[i : i + 2])
+            i += 1
+        elif ch == '"':
+            nxt = json_str[i + 1] if i + 1 < n else ""
+            if nxt in ',}]' or nxt == "":
+                out.append('"')
+                in_value = False
+            else:
+                out.append('\\"')
+        else:
+            out.append(ch)
+        i += 1
+    return "".join(out)
 
 
 def fix_json_structure(json_str):
     # Fix missing commas between array elements
-    json_str = re.sub(r'}\s*{', '},{', json_str)
-    
+    json_str = _MISSING_COMMA.sub('},{', json_str)
+
     # Fix unescaped quotes within string values
-    json_str = re.sub(r'(?<=: ")(.+?)(?="[,}])', lambda m: m.group(1).replace('"', '\\"'), json_str)
-    
-    return json_str
+    return _escape_inner_quotes(json_str)
+
+
+def _find_balanced_object(raw_str: str) -> str | None:
+    """Find the first balanced {...} span in a single linear pass.
+
+    Replaces the old nested-alternation regex, which recompiled per call and
+    could backtrack super-linearly on malformed input. Braces inside string
+    values are skipped by tracking quote/escape state.
+    """
+    start = -1
+    depth = 0
+    in_string = False
+    escape = False
+    for i, ch in enumerate(raw_str):
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == "{":
+            if depth == 0:
+                start = i
+            depth += 1
+        elif depth > 0:
+            if ch == "}":
+                depth -= 1
+                if depth == 0:
+                    return raw_str[start : i + 1]
+            elif ch == '"':
+                in_string = True
+    return None
+
 
 def extract_json_object(raw_str):
-    # Use a more compatible regex to extract JSON
-    json_pattern = r'\{(?:[^{}]|\{(?:[^{}]|\{[^{}]*\})*\})*\}'
-    json_match = re.search(json_pattern, raw_str, re.DOTALL)
-    if not json_match:
+    json_str = _find_balanced_object(raw_str)
+    if json_str is None:
         #log.warning(f"No valid JSON object found in the input string --- {raw_str}")
         return None
 
-    json_str = json_match.group(0)
-
     try:
         # Attempt to parse the JSON
-        json_obj = json.loads(json_str)
+        json_obj = _loads(json_str)
         return json_obj
     except json.JSONDecodeError as e:
         # last try. attempt a fix on the structure
         try:
             fixed_json_str = fix_json_structure(json_str)
-            json_obj = json.loads(fixed_json_str)
+            json_obj = _loads(fixed_json_str)
             return json_obj
         except json.JSONDecodeError as e:
             #log.info(f"After RegEx load, still a JSON parsing error: {str(e)}")
-            return None
\ No newline at end of file
+            return None
+
+class JsonPrefixValidator:
+    """Incrementally check that streamed text can still become JSON.
+
+    Fed chunk by chunk from a streaming response, this tracks just enough
+    state (quote/escape, bracket depth, whether the top-level value has
+    closed) to notice when the output has gone off the rails: no opening
+    bracket within a bounded prose prefix, or content continuing after the
+    top-level value has closed. A short preamble before the value is let
+    through because extract_json_object salvages exactly that shape; the
+    prefix bound only catches output that is clearly an essay, not JSON.
+    Aborting after the value closes is always safe - the chunks collected
+    so far already contain the complete value, so parse_or_repair succeeds
+    on the truncated output.
+    """
+
+    # Characters tolerated after the value closes: white space plus a
+    # ```json markdown fence.
+    _FILLER = frozenset(" \t\r\n`json")
+    # How much prose to tolerate before the opening bracket. Preambles like
+    # "Here is the JSON you asked for:" are recoverable and short; output
+    # still bracket-free after this much text is not going to be JSON.
+    _MAX_PREFIX = 256
+
+    def __init__(self):
+        self._started = False
+        self._done = False
+        self._in_string = False
+        self._escape = False
+        self._depth = 0
+        self._invalid = False
+        self._prefix_len = 0
+
+    def feed(self, chunk: str) -> bool:
+        """Consume a chunk; return False once the output cannot be JSON."""
+        if self._invalid:
+            return False
+        for ch in chunk:
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif not self._started:
+                if ch in "{[":
+                    self._started = True
+                    self._depth = 1
+                else:
+                    self._prefix_len += 1
+                    if self._prefix_len > self._MAX_PREFIX:
+                        self._invalid = True
+                        return False
+            elif self._done:
+                if ch not in self._FILLER:
+                    self._invalid = True
+                    return False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._done = True
+                elif self._depth < 0:
+                    self._invalid = True
+                    return False
+        return True
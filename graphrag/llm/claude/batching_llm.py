@@ -0,0 +1,112 @@
+# Licensed under the MIT License
+
+"""A Chat-based LLM that submits requests through the Message Batches API."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import uuid
+from typing import TYPE_CHECKING
+
+from .claude_chat_llm import ClaudeChatLLM
+from .claude_configuration import ClaudeConfiguration
+
+if TYPE_CHECKING:
+    from .types import ClaudeClientTypes
+
+log = logging.getLogger(__name__)
+
+DEFAULT_BATCH_WINDOW_MS = 50
+DEFAULT_BATCH_SIZE = 32
+_POLL_INTERVAL_SECONDS = 2.0
+
+FAILED_BATCH_ITEM_ERROR = "Batch request did not succeed"
+
+
+class BatchingClaudeLLM(ClaudeChatLLM):
+    """A chat LLM that coalesces requests into Message Batches API calls.
+
+    Requests arriving within the batch window are submitted together, halving
+    per-token cost on batch-eligible workloads and amortizing request setup.
+    Latency-sensitive callers should keep use_batches off: batch turnaround is
+    minutes, not seconds.
+    """
+
+    _pending: list[tuple[str, dict, asyncio.Future]]
+    _flush_task: asyncio.Task | None
+    _submit_tasks: set[asyncio.Task]
+
+    def __init__(self, client: ClaudeClientTypes, configuration: ClaudeConfiguration):
+        super().__init__(client, configuration)
+        self._pending = []
+        self._flush_task = None
+        self._submit_tasks = set()
+        self._batch_window_ms = configuration.lookup(
+            "batch_window_ms", DEFAULT_BATCH_WINDOW_MS
+        )
+        self._batch_size = configuration.lookup("batch_size", DEFAULT_BATCH_SIZE)
+
+    async def _create_completion(self, messages: list[dict], args: dict):
+        custom_id = uuid.uuid4().hex
+        params = {k: v for k, v in args.items() if v is not None}
+        params["messages"] = messages
+        future: asyncio.Future = asyncio.get_event_loop().create_future()
+        self._pending.append((custom_id, params, future))
+        if len(self._pending) >= self._batch_size:
+            self._flush()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_after_window())
+        return await future
+
+    async def _flush_after_window(self):
+        await asyncio.sleep(self._batch_window_ms / 1000)
+        self._flush_task = None
+        self._flush()
+
+    def _flush(self):
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        batch, self._pending = self._pending, []
+        if batch:
+            # Hold a strong reference until done: the event loop only keeps
+            # tasks weakly, and a garbage-collected submit/poll task would
+            # strand every caller awaiting the batch's futures.
+            task = asyncio.create_task(self._submit_batch(batch))
+            self._submit_tasks.add(task)
+            task.add_done_callback(self._submit_tasks.discard)
+
+    async def _submit_batch(self, batch: list[tuple[str, dict, asyncio.Future]]):
+        futures = {custom_id: future for custom_id, _, future in batch}
+        try:
+            submitted = await self.client.messages.batches.create(
+                requests=[
+                    {"custom_id": custom_id, "params": params}
+                    for custom_id, params, _ in batch
+                ]
+            )
+            while submitted.processing_status != "ended":
+                await asyncio.sleep(_POLL_INTERVAL_SECONDS)
+                submitted = await self.client.messages.batches.retrieve(submitted.id)
+            async for entry in await self.client.messages.batches.results(
+                submitted.id
+            ):
+                future = futures.pop(entry.custom_id, None)
+                if future is None or future.done():
+                    continue
+                if entry.result.type == "succeeded":
+                    future.set_result(entry.result.message.content[0].text)
+                else:
+                    future.set_exception(
+                        RuntimeError(f"{FAILED_BATCH_ITEM_ERROR}: {entry.result.type}")
+                    )
+        except Exception as e:  # noqa BLE001 - fan the failure out to all waiters
+            log.exception("batch submission failed")
+            for future in futures.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for future in futures.values():
+            if not future.done():
+                future.set_exception(RuntimeError(FAILED_BATCH_ITEM_ERROR))
@@ -2,8 +2,10 @@
 
 """The Chat-based language model."""
 
+from __future__ import annotations
+
 import logging
-from json import JSONDecodeError
+from typing import TYPE_CHECKING
 
 from typing_extensions import Unpack
 
@@ -15,17 +17,21 @@ from graphrag.llm.types import (
     LLMOutput,
 )
 
-from ._json import clean_up_json
+from ._json import JsonPrefixValidator, parse_or_repair
 from .claude_configuration import ClaudeConfiguration
-from .types import ClaudeClientTypes
 from .utils import (
     get_completion_llm_args,
+    partition_system,
     try_parse_json_object,
 )
 
+if TYPE_CHECKING:
+    from .types import ClaudeClientTypes
+
 log = logging.getLogger(__name__)
 
 _MAX_GENERATION_RETRIES = 3
+_JSON_RESPONSE_FORMAT = {"type": "json_object"}
 FAILED_TO_CREATE_JSON_ERROR = "Failed to generate valid JSON output"
 
 
@@ -48,28 +54,87 @@ class ClaudeChatLLM(BaseLLM[CompletionInput, CompletionOutput]):
         history = kwargs.get("history") or []
 
         # Extract system message if present
-        system_message = None
-        filtered_history = []
-        for message in history:
-            if message.get('role') == 'system':
-                system_message = message.get('content')
-            else:
-                filtered_history.append(message)
-
-        messages = [
-            *filtered_history,
-            {"role": "user", "content": input},
-        ]
-
-        # Add system message to args if found
-        if system_message:
-            args['system'] = system_message
-
+        system_message, filtered_history = partition_system(history)
+
+        if self.configuration.prompt_caching_enabled:
+            # Mark the system prompt and the latest user turn as cacheable so
+            # repeated calls reuse the server-side prefix instead of paying
+            # full prefill cost. Anthropic allows at most 4 cache_control
+            # blocks per request, so only these two are marked.
+            messages = [
+                *filtered_history,
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": input,
+                            "cache_control": {"type": "ephemeral"},
+                        }
+                    ],
+                },
+            ]
+            if system_message:
+                args['system'] = [
+                    {
+                        "type": "text",
+                        "text": system_message,
+                        "cache_control": {"type": "ephemeral"},
+                    }
+                ]
+        else:
+            messages = [
+                *filtered_history,
+                {"role": "user", "content": input},
+            ]
+
+            # Add system message to args if found
+            if system_message:
+                args['system'] = system_message
+
+        return await self._create_completion(messages, args)
+
+    async def _create_completion(
+        self, messages: list[dict], args: dict
+    ) -> CompletionOutput | None:
+        """Submit the assembled request. Overridden by the batching variant."""
+        if (
+            self.configuration.early_abort_on_bad_json
+            and args.get("response_format") is not None
+        ):
+            return await self._create_streaming_json(messages, args)
         response = await self.client.messages.create(
             messages=messages, **args
         )
         return response.content[0].text
 
+    async def _create_streaming_json(
+        self, messages: list[dict], args: dict
+    ) -> CompletionOutput | None:
+        """Stream a JSON response, aborting once it cannot parse.
+
+        Without this, a response that has already gone off the rails is still
+        generated to completion (and paid for) before validation fails and
+        _invoke_json retries. Closing the stream at the first structural
+        impossibility truncates that wasted-token window; the partial output
+        is returned as-is so the normal validation/retry path runs unchanged.
+        Enabled via early_abort_on_bad_json since it changes token accounting.
+        """
+        validator = JsonPrefixValidator()
+        parts: list[str] = []
+        async with self.client.messages.stream(
+            messages=messages, **args
+        ) as stream:
+            async for text in stream.text_stream:
+                parts.append(text)
+                if not validator.feed(text):
+                    log.info(
+                        "aborting generation early: streamed output is not valid JSON"
+                    )
+                    await stream.close()
+                    break
+        return "".join(parts)
+
 
     async def _invoke_json(
         self,
@@ -84,24 +149,23 @@ class ClaudeChatLLM(BaseLLM[CompletionInput, CompletionOutput]):
             attempt: int | None = None,
         ) -> LLMOutput[CompletionOutput]:
             call_name = name if attempt is None else f"{name}@{attempt}"
-            
-            # Create a copy of kwargs to avoid modifying the original
-            modified_kwargs = kwargs.copy()
-            
-            # If this is the second attempt (attempt == 1), update the model
-            if attempt > 0:
-                if self.configuration.model_alt:
-                    new_model = self.configuration.model_alt
-                    modified_kwargs['model'] = new_model
-            
-            # Update the name in the kwargs
-            modified_kwargs['name'] = call_name
-
-            return (
-                await self._native_json(input, **modified_kwargs)
-                if self.configuration.model_supports_json
-                else await self._manual_json(input, **modified_kwargs)
-            )
+
+            # Build only the delta and merge it into kwargs once at the call,
+            # instead of copying kwargs up front and mutating the copy.
+            overrides: dict = {"name": call_name}
+
+            # On retry attempts, switch to the alternate model if configured
+            if attempt and self.configuration.model_alt:
+                overrides['model'] = self.configuration.model_alt
+
+            if self.configuration.model_supports_json:
+                # Merge the JSON response format here, once, so _native_json
+                # can forward kwargs without rebuilding the dicts per call.
+                model_parameters = dict(kwargs.get("model_parameters") or {})
+                model_parameters["response_format"] = _JSON_RESPONSE_FORMAT
+                overrides["model_parameters"] = model_parameters
+                return await self._native_json(input, **{**kwargs, **overrides})
+            return await self._manual_json(input, **{**kwargs, **overrides})
 
         def is_valid(x: dict | None) -> bool:
             return x is not None and is_response_valid(x)
@@ -120,17 +184,12 @@ class ClaudeChatLLM(BaseLLM[CompletionInput, CompletionOutput]):
     async def _native_json(
         self, input: CompletionInput, **kwargs: Unpack[LLMInput]
     ) -> LLMOutput[CompletionOutput]:
-        """Generate JSON output using a model's native JSON-output support."""
-        result = await self._invoke(
-            input,
-            **{
-                **kwargs,
-                "model_parameters": {
-                    **(kwargs.get("model_parameters") or {}),
-                    "response_format": {"type": "json_object"},
-                },
-            },
-        )
+        """Generate JSON output using a model's native JSON-output support.
+
+        The json_object response format is already merged into kwargs by
+        _invoke_json.
+        """
+        result = await self._invoke(input, **kwargs)
 
         raw_output = result.output or ""
         json_output = try_parse_json_object(raw_output)
@@ -147,16 +206,14 @@ class ClaudeChatLLM(BaseLLM[CompletionInput, CompletionOutput]):
         # Otherwise, clean up the output and try to parse it as json
         result = await self._invoke(input, **kwargs)
         history = result.history or []
-        output = clean_up_json(result.output or "")
-        try:
-            json_output = try_parse_json_object(output)
+        output, json_output = parse_or_repair(result.output or "")
+        if isinstance(json_output, dict):
             return LLMOutput[CompletionOutput](
                 output=output, json=json_output, history=history
             )
-        except (TypeError, JSONDecodeError):
-            # log.warning("error parsing llm json, retrying")
-            return LLMOutput[CompletionOutput](
-                output="",
-                json="",
-                history=history,
-            )
+        # log.warning("error parsing llm json, retrying")
+        return LLMOutput[CompletionOutput](
+            output="",
+            json="",
+            history=history,
+        )
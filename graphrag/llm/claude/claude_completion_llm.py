@@ -2,7 +2,10 @@
 
 """A text-completion based LLM."""
 
+from __future__ import annotations
+
 import logging
+from typing import TYPE_CHECKING
 
 from typing_extensions import Unpack
 
@@ -14,9 +17,11 @@ from graphrag.llm.types import (
 )
 
 from .claude_configuration import ClaudeConfiguration
-from .types import ClaudeClientTypes
 from .utils import get_completion_llm_args
 
+if TYPE_CHECKING:
+    from .types import ClaudeClientTypes
+
 log = logging.getLogger(__name__)
 
 
@@ -49,9 +49,14 @@ class ClaudeConfiguration(Hashable, LLMConfig):
 
     # The raw configuration object
     _raw_config: dict
+    _hash: int
 
     # Feature Flags
     _model_supports_json: bool | None
+    _early_abort_on_bad_json: bool | None
+    _prompt_caching_enabled: bool | None
+    _semantic_cache_enabled: bool | None
+    _use_batches: bool | None
 
     # Custom Configuration
     _tokens_per_minute: int | None
@@ -101,33 +106,49 @@ class ClaudeConfiguration(Hashable, LLMConfig):
         self._api_key = lookup_required("api_key")
         self._model = lookup_required("model")
         self._model_alt = lookup_str("model_alt")
-        self._deployment_name = lookup_str("deployment_name")
-        self._api_base = lookup_str("api_base")
-        self._api_version = lookup_str("api_version")
-        self._cognitive_services_endpoint = lookup_str("cognitive_services_endpoint")
-        self._organization = lookup_str("organization")
-        self._proxy = lookup_str("proxy")
+        # Values behind _non_blank properties are normalized once here so the
+        # properties themselves are plain attribute reads on the hot path.
+        self._deployment_name = _non_blank(lookup_str("deployment_name"))
+        api_base = _non_blank(lookup_str("api_base"))
+        # Remove trailing slash
+        self._api_base = (
+            api_base[:-1] if api_base and api_base.endswith("/") else api_base
+        )
+        self._api_version = _non_blank(lookup_str("api_version"))
+        self._cognitive_services_endpoint = _non_blank(
+            lookup_str("cognitive_services_endpoint")
+        )
+        self._organization = _non_blank(lookup_str("organization"))
+        self._proxy = _non_blank(lookup_str("proxy"))
         # self._n = lookup_int("n")
         self._temperature = lookup_float("temperature")
         # self._frequency_penalty = lookup_float("frequency_penalty")
         # self._presence_penalty = lookup_float("presence_penalty")
         self._top_p = lookup_float("top_p")
         self._max_tokens = lookup_int("max_tokens")
-        self._response_format = lookup_str("response_format")
+        self._response_format = _non_blank(lookup_str("response_format"))
         self._logit_bias = lookup_dict("logit_bias")
         self._stop = lookup_list("stop")
         self._max_retries = lookup_int("max_retries")
         self._request_timeout = lookup_float("request_timeout")
         self._model_supports_json = lookup_bool("model_supports_json")
+        self._early_abort_on_bad_json = lookup_bool("early_abort_on_bad_json")
+        self._prompt_caching_enabled = lookup_bool("prompt_caching_enabled")
+        self._semantic_cache_enabled = lookup_bool("semantic_cache_enabled")
+        self._use_batches = lookup_bool("use_batches")
         self._tokens_per_minute = lookup_int("tokens_per_minute")
         self._requests_per_minute = lookup_int("requests_per_minute")
         self._concurrent_requests = lookup_int("concurrent_requests")
-        self._encoding_model = lookup_str("encoding_model")
+        self._encoding_model = _non_blank(lookup_str("encoding_model"))
         self._max_retry_wait = lookup_float("max_retry_wait")
         self._sleep_on_rate_limit_recommendation = lookup_bool(
             "sleep_on_rate_limit_recommendation"
         )
         self._raw_config = config
+        # The instance is immutable after construction, so hash once; the old
+        # tuple(sorted(...)) approach also re-sorted per hash call and broke
+        # on unhashable values such as stop lists.
+        self._hash = hash(json.dumps(config, sort_keys=True, default=repr))
 
     @property
     def api_key(self) -> str:
@@ -147,34 +168,32 @@ class ClaudeConfiguration(Hashable, LLMConfig):
     @property
     def deployment_name(self) -> str | None:
         """Deployment name property definition."""
-        return _non_blank(self._deployment_name)
+        return self._deployment_name
 
     @property
     def api_base(self) -> str | None:
         """API base property definition."""
-        result = _non_blank(self._api_base)
-        # Remove trailing slash
-        return result[:-1] if result and result.endswith("/") else result
+        return self._api_base
 
     @property
     def api_version(self) -> str | None:
         """API version property definition."""
-        return _non_blank(self._api_version)
+        return self._api_version
 
     @property
     def cognitive_services_endpoint(self) -> str | None:
         """API version property definition."""
-        return _non_blank(self._cognitive_services_endpoint)
+        return self._cognitive_services_endpoint
 
     @property
     def organization(self) -> str | None:
         """Organization property definition."""
-        return _non_blank(self._organization)
+        return self._organization
 
     @property
     def proxy(self) -> str | None:
         """Proxy property definition."""
-        return _non_blank(self._proxy)
+        return self._proxy
 
     # @property
     # def n(self) -> int | None:
@@ -209,7 +228,7 @@ class ClaudeConfiguration(Hashable, LLMConfig):
     @property
     def response_format(self) -> str | None:
         """Response format property definition."""
-        return _non_blank(self._response_format)
+        return self._response_format
 
     @property
     def logit_bias(self) -> dict[str, float] | None:
@@ -241,6 +260,26 @@ class ClaudeConfiguration(Hashable, LLMConfig):
         """Model supports json property definition."""
         return self._model_supports_json
 
+    @property
+    def early_abort_on_bad_json(self) -> bool | None:
+        """Early abort on bad json property definition."""
+        return self._early_abort_on_bad_json
+
+    @property
+    def prompt_caching_enabled(self) -> bool | None:
+        """Prompt caching enabled property definition."""
+        return self._prompt_caching_enabled
+
+    @property
+    def semantic_cache_enabled(self) -> bool | None:
+        """Semantic cache enabled property definition."""
+        return self._semantic_cache_enabled
+
+    @property
+    def use_batches(self) -> bool | None:
+        """Use the Message Batches API property definition."""
+        return self._use_batches
+
     @property
     def tokens_per_minute(self) -> int | None:
         """Tokens per minute property definition."""
@@ -259,7 +298,7 @@ class ClaudeConfiguration(Hashable, LLMConfig):
     @property
     def encoding_model(self) -> str | None:
         """Encoding model property definition."""
-        return _non_blank(self._encoding_model)
+        return self._encoding_model
 
     @property
     def sleep_on_rate_limit_recommendation(self) -> bool | None:
@@ -291,4 +330,4 @@ class ClaudeConfiguration(Hashable, LLMConfig):
 
     def __hash__(self) -> int:
         """Hash method definition."""
-        return hash(tuple(sorted(self._raw_config.items())))
+        return self._hash
@@ -31,6 +31,9 @@ class ClaudeTokenReplacingLLM(LLM[CompletionInput, CompletionOutput]):
     ) -> LLMOutput[CompletionOutput]:
         """Call the LLM with the input and kwargs."""
         variables = kwargs.get("variables")
+        if not variables:
+            # Nothing to substitute; skip the full template walk of the input.
+            return await self._delegate(input, **kwargs)
         history = kwargs.get("history") or []
         input = perform_variable_replacements(input, history, variables)
         return await self._delegate(input, **kwargs)
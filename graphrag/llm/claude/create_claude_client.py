@@ -2,27 +2,100 @@
 
 """Create Claude client instance."""
 
+from __future__ import annotations
+
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 from functools import cache
-
-from anthropic import AsyncAnthropic
+from typing import TYPE_CHECKING
 
 from .claude_configuration import ClaudeConfiguration
-from .types import ClaudeClientTypes
+
+if TYPE_CHECKING:
+    from .types import ClaudeClientTypes
 
 log = logging.getLogger(__name__)
 
+_DEFAULT_CONCURRENT_REQUESTS = 8
+
+
+@cache
+def _http2_available() -> bool:
+    """Probe for the optional h2 package; httpx needs it for HTTP/2."""
+    try:
+        import h2  # noqa: F401 - presence check only
+    except ImportError:
+        return False
+    return True
+
+
+class _GatedNamespace:
+    """A proxy over an SDK resource namespace that gates request entry points.
+
+    Serializing calls through a semaphore keeps wide asyncio.gather fan-outs
+    below Anthropic's concurrent-request ceiling instead of triggering 429
+    storms that burn wall-clock in retry backoff.
+    """
+
+    def __init__(self, delegate, semaphore: asyncio.Semaphore):
+        self._delegate = delegate
+        self._semaphore = semaphore
+
+    def __getattr__(self, name):
+        return getattr(self._delegate, name)
+
+    async def create(self, *args, **kwargs):
+        async with self._semaphore:
+            return await self._delegate.create(*args, **kwargs)
+
+    @asynccontextmanager
+    async def stream(self, *args, **kwargs):
+        # A streaming request occupies a concurrent-request slot for its
+        # whole lifetime, so the semaphore is held until the stream closes.
+        async with self._semaphore:
+            async with self._delegate.stream(*args, **kwargs) as stream:
+                yield stream
+
 
 @cache
 def create_claude_client(
     configuration: ClaudeConfiguration
 ) -> ClaudeClientTypes:
     """Create a new Claude client instance."""
+    # Imported here rather than at module scope so that importing graphrag
+    # does not pay for anthropic (and its httpx/pydantic stack) unless a
+    # client is actually created.
+    import httpx
+    from anthropic import AsyncAnthropic, DefaultAsyncHttpxClient
+
     log.info("Creating Claude client base_url=%s", configuration.api_base)
-    return AsyncAnthropic(
+    # A tuned pool (and HTTP/2 multiplexing when h2 is installed) instead of
+    # httpx's small HTTP/1.1 default, so high-concurrency fan-out doesn't
+    # churn connections or head-of-line block. The SDK's own httpx wrapper is
+    # used (rather than a raw httpx.AsyncClient) so the client stays typed
+    # for whatever httpx flavor the SDK is built against.
+    http_client = DefaultAsyncHttpxClient(
+        http2=_http2_available(),
+        limits=httpx.Limits(max_keepalive_connections=64, max_connections=128),
+        timeout=configuration.request_timeout or 180.0,
+    )
+    client = AsyncAnthropic(
         api_key=configuration.api_key,
         base_url=configuration.api_base,
         # Timeout/Retry Configuration - Use Tenacity for Retries, so disable them here
         timeout=configuration.request_timeout or 180.0,
         max_retries=0,
+        http_client=http_client,
+    )
+    # Kept alive alongside the cached client.
+    client._graphrag_http_client = http_client
+    # One semaphore per cached client, shared by both namespaces.
+    semaphore = asyncio.Semaphore(
+        configuration.concurrent_requests or _DEFAULT_CONCURRENT_REQUESTS
     )
+    client.messages = _GatedNamespace(client.messages, semaphore)
+    if hasattr(client, "completions"):
+        # Not present on newer SDK versions, which are messages-only.
+        client.completions = _GatedNamespace(client.completions, semaphore)
+    return client
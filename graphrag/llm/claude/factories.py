@@ -2,7 +2,10 @@
 
 """Factory functions for creating Claude LLMs."""
 
+from __future__ import annotations
+
 import asyncio
+from typing import TYPE_CHECKING
 
 from graphrag.llm.base import CachingLLM, RateLimitingLLM
 from graphrag.llm.limiting import LLMLimiter
@@ -16,21 +19,24 @@ from graphrag.llm.types import (
     OnCacheActionFn,
 )
 
+from .batching_llm import BatchingClaudeLLM
 from .json_parsing_llm import JsonParsingLLM
 from .claude_chat_llm import ClaudeChatLLM
 from .claude_completion_llm import ClaudeCompletionLLM
 from .claude_configuration import ClaudeConfiguration
 from .claude_history_tracking_llm import ClaudeHistoryTrackingLLM
+from .single_flight_llm import SingleFlightLLM
 from .claude_token_replacing_llm import ClaudeTokenReplacingLLM
-from .types import ClaudeClientTypes
 from .utils import (
-    RATE_LIMIT_ERRORS,
-    RETRYABLE_ERRORS,
+    fast_hash,
     get_completion_cache_args,
     get_sleep_time_from_error,
     get_token_counter,
 )
 
+if TYPE_CHECKING:
+    from .types import ClaudeClientTypes
+
 
 def create_claude_chat_llm(
     client: ClaudeClientTypes,
@@ -45,12 +51,18 @@ def create_claude_chat_llm(
 ) -> CompletionLLM:
     """Create an Claude chat LLM."""
     operation = "chat"
-    result = ClaudeChatLLM(client, config)
+    result = (
+        BatchingClaudeLLM(client, config)
+        if config.use_batches
+        else ClaudeChatLLM(client, config)
+    )
     result.on_error(on_error)
     if limiter is not None or semaphore is not None:
         result = _rate_limited(result, config, operation, limiter, semaphore, on_invoke)
     if cache is not None:
         result = _cached(result, config, operation, cache, on_cache_hit, on_cache_miss)
+    # Above the cache so concurrent duplicates coalesce before both miss it.
+    result = SingleFlightLLM(result)
     result = ClaudeHistoryTrackingLLM(result)
     result = ClaudeTokenReplacingLLM(result)
     return JsonParsingLLM(result)
@@ -86,12 +98,17 @@ def _rate_limited(
     semaphore: asyncio.Semaphore | None,
     on_invoke: LLMInvocationFn | None,
 ):
+    # Attribute access (not a from-import) so the error lists - which import
+    # anthropic on first touch - are only materialized when a rate-limited
+    # LLM is actually built.
+    from . import utils
+
     result = RateLimitingLLM(
         delegate,
         config,
         operation,
-        RETRYABLE_ERRORS,
-        RATE_LIMIT_ERRORS,
+        utils.RETRYABLE_ERRORS,
+        utils.RATE_LIMIT_ERRORS,
         limiter,
         semaphore,
         get_token_counter(config),
@@ -113,4 +130,44 @@ def _cached(
     result = CachingLLM(delegate, cache_args, operation, cache)
     result.on_cache_hit(on_cache_hit)
     result.on_cache_miss(on_cache_miss)
+    if config.semantic_cache_enabled:
+        result = _semantic_cached(result, config, operation)
     return result
+
+
+def _semantic_cached(
+    delegate: LLM,
+    config: ClaudeConfiguration,
+    operation: str,
+):
+    # Imported lazily so the optional sqlite-vec/sentence-transformers deps
+    # are only required when the semantic cache is turned on.
+    from .semantic_cache_llm import (
+        DEFAULT_SIMILARITY_THRESHOLD,
+        DEFAULT_TTL_DAYS,
+        SemanticCachingLLM,
+        create_semantic_cache_store,
+    )
+
+    store = create_semantic_cache_store(
+        config.lookup("semantic_cache_db", "claude_semantic_cache.db"),
+        ttl_days=config.lookup("semantic_cache_ttl_days", DEFAULT_TTL_DAYS),
+    )
+    if store is None:
+        return delegate
+    # Scope the store's operation key by the model and generation parameters:
+    # the default DB is shared (and entries live for days), and a response is
+    # only valid for the exact configuration that produced it. Folding the
+    # fingerprint into the operation covers both the exact-hash lookup and
+    # the vector probe, which filter on operation.
+    config_fingerprint = fast_hash(
+        repr(sorted(get_completion_cache_args(config).items())).encode("utf-8")
+    )
+    return SemanticCachingLLM(
+        delegate,
+        store,
+        f"{operation}:{config_fingerprint[:16]}",
+        threshold=config.lookup(
+            "semantic_cache_threshold", DEFAULT_SIMILARITY_THRESHOLD
+        ),
+    )
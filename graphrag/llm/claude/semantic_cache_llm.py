@@ -0,0 +1,219 @@
+# Licensed under the MIT License
+
+"""A semantic response cache for Claude LLMs."""
+
+import logging
+import sqlite3
+import struct
+import time
+
+from typing_extensions import Unpack
+
+from graphrag.llm.types import (
+    LLM,
+    CompletionInput,
+    CompletionLLM,
+    CompletionOutput,
+    LLMInput,
+    LLMOutput,
+)
+
+from .utils import fast_hash
+
+log = logging.getLogger(__name__)
+
+DEFAULT_SIMILARITY_THRESHOLD = 0.97
+DEFAULT_TTL_DAYS = 7
+
+_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+# Loaded once on first use so importing this module stays cheap and the
+# optional dependencies are only required when the cache is enabled.
+_embedder = None
+
+
+class _OnnxEmbedder:
+    """MiniLM through onnxruntime - several times faster than FP32 PyTorch
+    on CPU, which matters because embedding runs inline on the request path."""
+
+    def __init__(self):
+        from optimum.onnxruntime import ORTModelForFeatureExtraction
+        from transformers import AutoTokenizer
+
+        self._model = ORTModelForFeatureExtraction.from_pretrained(
+            _EMBEDDING_MODEL, export=True, provider="CPUExecutionProvider"
+        )
+        self._tokenizer = AutoTokenizer.from_pretrained(_EMBEDDING_MODEL)
+
+    def encode(self, text: str):
+        import numpy as np
+
+        tokens = self._tokenizer(text, truncation=True, return_tensors="np")
+        hidden = self._model(**tokens).last_hidden_state[0]
+        mask = tokens["attention_mask"][0][:, None]
+        vector = (hidden * mask).sum(axis=0) / mask.sum()
+        return vector / np.linalg.norm(vector)
+
+
+class _TorchEmbedder:
+    """Fallback embedder when optimum/onnxruntime are not installed."""
+
+    def __init__(self):
+        from sentence_transformers import SentenceTransformer
+
+        self._model = SentenceTransformer(_EMBEDDING_MODEL)
+
+    def encode(self, text: str):
+        return self._model.encode(text, normalize_embeddings=True)
+
+
+def _load_embedder():
+    global _embedder
+    if _embedder is None:
+        try:
+            _embedder = _OnnxEmbedder()
+        except ImportError:
+            _embedder = _TorchEmbedder()
+    return _embedder
+
+
+def _embed(text: str) -> bytes:
+    """Embed text as a unit-normalized float32 vector (cosine == dot)."""
+    vector = _load_embedder().encode(text)
+    return struct.pack(f"{len(vector)}f", *vector)
+
+
+def _prompt_hash(input: str, history: list[dict] | None) -> str:
+    parts = [input.encode("utf-8", "ignore")]
+    if history:
+        parts.append(repr(history).encode("utf-8", "ignore"))
+    return fast_hash(*parts)
+
+
+class SemanticCacheStore:
+    """A sqlite + sqlite-vec backed store of prompt embeddings and responses."""
+
+    _db: sqlite3.Connection
+    _ttl_seconds: float
+
+    def __init__(self, db_path: str, ttl_days: float = DEFAULT_TTL_DAYS):
+        import sqlite_vec
+
+        self._db = sqlite3.connect(db_path)
+        self._db.enable_load_extension(True)
+        sqlite_vec.load(self._db)
+        self._db.enable_load_extension(False)
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS semantic_cache (
+                operation TEXT NOT NULL,
+                prompt_hash TEXT NOT NULL,
+                embedding BLOB NOT NULL,
+                response TEXT NOT NULL,
+                ts REAL NOT NULL
+            )
+            """
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS semantic_cache_op_hash"
+            " ON semantic_cache (operation, prompt_hash)"
+        )
+        self._db.commit()
+        self._ttl_seconds = ttl_days * 86_400
+
+    def find(
+        self, operation: str, prompt_hash: str, embedding: bytes, threshold: float
+    ) -> str | None:
+        """Find a cached response by exact hash or by embedding similarity."""
+        cutoff = time.time() - self._ttl_seconds
+        row = self._db.execute(
+            "SELECT response FROM semantic_cache"
+            " WHERE operation = ? AND prompt_hash = ? AND ts >= ? LIMIT 1",
+            (operation, prompt_hash, cutoff),
+        ).fetchone()
+        if row is not None:
+            return row[0]
+        row = self._db.execute(
+            "SELECT response, vec_distance_cosine(embedding, ?) AS distance"
+            " FROM semantic_cache WHERE operation = ? AND ts >= ?"
+            " ORDER BY distance LIMIT 1",
+            (embedding, operation, cutoff),
+        ).fetchone()
+        if row is not None and row[1] <= 1 - threshold:
+            return row[0]
+        return None
+
+    def insert(
+        self, operation: str, prompt_hash: str, embedding: bytes, response: str
+    ) -> None:
+        """Insert a response, evicting anything past its TTL."""
+        now = time.time()
+        self._db.execute(
+            "DELETE FROM semantic_cache WHERE ts < ?", (now - self._ttl_seconds,)
+        )
+        self._db.execute(
+            "INSERT INTO semantic_cache (operation, prompt_hash, embedding, response, ts)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (operation, prompt_hash, embedding, response, now),
+        )
+        self._db.commit()
+
+
+def create_semantic_cache_store(
+    db_path: str, ttl_days: float = DEFAULT_TTL_DAYS
+) -> SemanticCacheStore | None:
+    """Create a semantic cache store, or None if the optional deps are missing."""
+    try:
+        store = SemanticCacheStore(db_path, ttl_days)
+        _load_embedder()
+    except ImportError as e:
+        log.warning(
+            "semantic cache disabled, missing optional dependency: %s", e
+        )
+        return None
+    return store
+
+
+class SemanticCachingLLM(LLM[CompletionInput, CompletionOutput]):
+    """An LLM that serves semantically-similar cached responses.
+
+    Sits in front of the exact-key cache: near-duplicate prompts (common in
+    GraphRAG entity extraction over overlapping chunks) are answered from a
+    local vector probe instead of a full Claude round-trip.
+    """
+
+    _delegate: CompletionLLM
+    _store: SemanticCacheStore
+    _operation: str
+    _threshold: float
+
+    def __init__(
+        self,
+        delegate: CompletionLLM,
+        store: SemanticCacheStore,
+        operation: str,
+        threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+    ):
+        self._delegate = delegate
+        self._store = store
+        self._operation = operation
+        self._threshold = threshold
+
+    async def __call__(
+        self,
+        input: CompletionInput,
+        **kwargs: Unpack[LLMInput],
+    ) -> LLMOutput[CompletionOutput]:
+        """Call the LLM, serving a cached response on a semantic hit."""
+        history = kwargs.get("history")
+        prompt_hash = _prompt_hash(input, history)
+        embedding = _embed(input)
+        cached = self._store.find(
+            self._operation, prompt_hash, embedding, self._threshold
+        )
+        if cached is not None:
+            return LLMOutput(output=cached)
+        result = await self._delegate(input, **kwargs)
+        if result.output is not None:
+            self._store.insert(self._operation, prompt_hash, embedding, result.output)
+        return result
@@ -0,0 +1,75 @@
+# Licensed under the MIT License
+
+"""An LLM that coalesces identical in-flight requests."""
+
+import asyncio
+
+from typing_extensions import Unpack
+
+from graphrag.llm.types import (
+    LLM,
+    CompletionInput,
+    CompletionLLM,
+    CompletionOutput,
+    LLMInput,
+    LLMOutput,
+)
+
+from .utils import fast_hash
+
+
+def _request_key(input: CompletionInput, kwargs: LLMInput) -> str:
+    return fast_hash(
+        str(input).encode("utf-8", "ignore"),
+        repr((
+            kwargs.get("json"),
+            kwargs.get("model_parameters"),
+            kwargs.get("history"),
+        )).encode("utf-8", "ignore"),
+    )
+
+
+class SingleFlightLLM(LLM[CompletionInput, CompletionOutput]):
+    """An LLM that deduplicates concurrent identical requests.
+
+    GraphRAG frequently fires the same prompt from several coroutines at
+    once (overlapping chunks); the response cache only helps after the first
+    response lands, so every concurrent duplicate still pays a full Claude
+    call. Duplicates now await the in-flight future instead.
+    """
+
+    _delegate: CompletionLLM
+    _inflight: dict[str, asyncio.Future]
+
+    def __init__(self, delegate: CompletionLLM):
+        self._delegate = delegate
+        self._inflight = {}
+
+    async def __call__(
+        self,
+        input: CompletionInput,
+        **kwargs: Unpack[LLMInput],
+    ) -> LLMOutput[CompletionOutput]:
+        """Call the LLM, awaiting any identical in-flight request."""
+        key = _request_key(input, kwargs)
+        existing = self._inflight.get(key)
+        if existing is not None:
+            return await asyncio.shield(existing)
+
+        future: asyncio.Future = asyncio.get_event_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await self._delegate(input, **kwargs)
+        except BaseException as e:
+            # BaseException, not Exception: a cancelled leader must still
+            # resolve the shared future or every coalesced waiter hangs
+            # forever, and cancellation is routine in pipeline fan-outs.
+            future.set_exception(e)
+            # Mark retrieved so no warning fires when nothing awaited it.
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._inflight[key]
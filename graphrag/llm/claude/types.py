@@ -2,6 +2,23 @@
 
 """A base class for Claude-based LLMs."""
 
-from anthropic import AsyncAnthropic
+from typing import TYPE_CHECKING
 
-ClaudeClientTypes = AsyncAnthropic
+if TYPE_CHECKING:
+    from anthropic import AsyncAnthropic
+
+    ClaudeClientTypes = AsyncAnthropic
+
+
+def __getattr__(name: str):
+    """Resolve the client alias lazily (PEP 562).
+
+    Importing anthropic pulls in httpx and pydantic; deferring it keeps
+    `import graphrag` fast for commands that never touch Claude.
+    """
+    if name == "ClaudeClientTypes":
+        from anthropic import AsyncAnthropic
+
+        return AsyncAnthropic
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
@@ -2,6 +2,7 @@
 
 """Utility functions for the Claude API."""
 
+import hashlib
 import json
 import re
 import logging
@@ -9,29 +10,66 @@ from collections.abc import Callable
 from typing import Any
 
 import tiktoken
-from anthropic import (
-    APIConnectionError,
-    InternalServerError,
-    RateLimitError,
-)
 
-from ._json import clean_up_json
+from ._json import parse_or_repair
 from .claude_configuration import ClaudeConfiguration
 
 DEFAULT_ENCODING = "cl100k_base"
 
 _encoders: dict[str, tiktoken.Encoding] = {}
 
-RETRYABLE_ERRORS: list[type[Exception]] = [
-    RateLimitError,
-    APIConnectionError,
-    InternalServerError,
-]
-RATE_LIMIT_ERRORS: list[type[Exception]] = [RateLimitError]
-
 log = logging.getLogger(__name__)
 
 
+def __getattr__(name: str) -> Any:
+    """Materialize the anthropic error lists on first access (PEP 562).
+
+    Importing anthropic drags in httpx and pydantic; deferring it here keeps
+    `import graphrag` fast for code paths that never build a Claude LLM. The
+    lists are cached in module globals so subsequent lookups are plain reads.
+    """
+    if name in ("RETRYABLE_ERRORS", "RATE_LIMIT_ERRORS"):
+        from anthropic import (
+            APIConnectionError,
+            InternalServerError,
+            RateLimitError,
+        )
+
+        globals()["RETRYABLE_ERRORS"] = [
+            RateLimitError,
+            APIConnectionError,
+            InternalServerError,
+        ]
+        globals()["RATE_LIMIT_ERRORS"] = [RateLimitError]
+        return globals()[name]
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
+
+
+try:
+    import blake3
+
+    def fast_hash(*parts: bytes) -> str:
+        """Hash byte chunks with BLAKE3 (SIMD-accelerated C implementation)."""
+        hasher = blake3.blake3()
+        for part in parts:
+            hasher.update(part)
+        return hasher.hexdigest()
+
+except ImportError:
+
+    def fast_hash(*parts: bytes) -> str:
+        """Hash byte chunks with SHA-256 (OpenSSL dispatches to SHA-NI).
+
+        Chunks are streamed into the hasher rather than concatenated first,
+        so no intermediate bytes object is built for large prompts.
+        """
+        hasher = hashlib.sha256()
+        for part in parts:
+            hasher.update(part)
+        return hasher.hexdigest()
+
+
 def get_token_counter(config: ClaudeConfiguration) -> Callable[[str], int]:
     """Get a function that counts the number of tokens in a string."""
     model = config.encoding_model or "cl100k_base"
@@ -43,6 +81,30 @@ def get_token_counter(config: ClaudeConfiguration) -> Callable[[str], int]:
     return lambda s: len(enc.encode(s))
 
 
+def partition_system(
+    messages: list[dict],
+) -> tuple[str | None, list[dict]]:
+    """Partition the system messages (if any) out of a chat history.
+
+    Returns the first system message's content and the remaining messages,
+    built in a single pass with one role lookup per item. Every system
+    entry is excluded from the returned list - the messages API rejects
+    system roles inside messages outright. The original list is returned
+    unchanged when no system message is present.
+    """
+    system_message: str | None = None
+    filtered: list[dict] = []
+    for message in messages:
+        if message.get("role") == "system":
+            if system_message is None:
+                system_message = message.get("content")
+        else:
+            filtered.append(message)
+    if system_message is None:
+        return None, messages
+    return system_message, filtered
+
+
 def perform_variable_replacements(
     input: str, history: list[dict], variables: dict | None
 ) -> str:
@@ -81,26 +143,33 @@ def get_completion_cache_args(configuration: ClaudeConfiguration) -> dict:
 def get_completion_llm_args(
     parameters: dict | None, configuration: ClaudeConfiguration
 ) -> dict:
-    """Get the arguments for a completion LLM."""
-    return {
-        **get_completion_cache_args(configuration),
-        **(parameters or {}),
-    }
+    """Get the arguments for a completion LLM.
+
+    The configuration-derived portion is memoized on the configuration
+    instance - it is rebuilt from property walks otherwise, once per call,
+    with the same result every time. A fresh merged dict is still returned
+    so callers can mutate it (they do: args['system'] = ...).
+    """
+    base = getattr(configuration, "_completion_llm_args", None)
+    if base is None:
+        base = get_completion_cache_args(configuration)
+        configuration._completion_llm_args = base
+    return {**base, **(parameters or {})}
 
 def try_parse_json_object(input: str) -> dict:
     """Generate JSON-string output using best-attempt prompting & parsing techniques."""
     try:
         result = json.loads(input)
     except json.JSONDecodeError:
-        # If parsing fails, try to parse it as a JSON object
-        clean_json_str = clean_up_json(input)
-        result = json.loads(clean_json_str)
+        # If parsing fails, clean up and repair the string; parse_or_repair
+        # hands back the already-parsed object so the cleaned string isn't
+        # parsed a second time.
+        _cleaned, result = parse_or_repair(input)
 
         if result is None:
             log.exception("error loading json, json=%s", input)
             raise
-        else:
-            return result
+        return result
     else:
         if not isinstance(result, dict):
             raise TypeError
@@ -109,6 +178,8 @@ def try_parse_json_object(input: str) -> dict:
 
 def get_sleep_time_from_error(e: Any) -> float:
     """Extract the sleep time value from a RateLimitError. This is usually only available in Azure."""
+    from anthropic import RateLimitError
+
     sleep_time = 0.0
     if isinstance(e, RateLimitError) and _please_retry_after in str(e):
         # could be second or seconds
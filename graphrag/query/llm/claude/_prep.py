@@ -0,0 +1,30 @@
+# Licensed under the MIT License
+
+"""Request-preparation helpers for the Claude query wrappers.
+
+Kept in their own module with precise annotations so the hot
+request-prep path can be compiled ahead of time (`mypyc _prep.py`
+produces a drop-in `_prep_compiled` extension that claude.py prefers
+when present). The pure-Python forms here are the canonical behavior.
+"""
+
+from typing import Any
+
+
+def split_system(
+    messages: str | list[dict[str, Any]],
+) -> tuple[str | None, str | list[dict[str, Any]]]:
+    """Split the system message (if any) out of a message list.
+
+    Returns the system content and the remaining messages. Str input and
+    lists without a system message pass through untouched, so the common
+    path allocates nothing.
+    """
+    if isinstance(messages, str):
+        return None, messages
+    system_message = next(
+        (m.get("content") for m in messages if m.get("role") == "system"), None
+    )
+    if system_message is None:
+        return None, messages
+    return system_message, [m for m in messages if m.get("role") != "system"]
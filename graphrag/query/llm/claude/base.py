@@ -2,19 +2,97 @@
 
 """Base classes for LLM and Embedding models."""
 
+from __future__ import annotations
+
 from abc import ABC, abstractmethod
 from collections.abc import Callable
-
-from anthropic import AsyncAnthropic, Anthropic
+from functools import lru_cache
+from typing import TYPE_CHECKING
 
 from graphrag.query.llm.base import BaseTextEmbedding
 from graphrag.query.llm.claude.typing import ClaudeApiType
 from graphrag.query.progress import ConsoleStatusReporter, StatusReporter
 
+if TYPE_CHECKING:
+    from anthropic import Anthropic, AsyncAnthropic
+
+
+@lru_cache(maxsize=8)
+def _shared_sync_client(
+    api_key: str | None,
+    api_base: str | None,
+    timeout: float,
+    max_retries: int,
+) -> Anthropic:
+    """Build (or reuse) the sync client for an endpoint.
+
+    Wrappers targeting the same endpoint share one keep-alive connection
+    pool instead of each paying TCP + TLS setup on their first request.
+    The cache owns the clients: no individual wrapper may close one, since
+    a closed client would keep being handed out and would kill the
+    transport under every other live wrapper on the endpoint.
+    """
+    import httpx
+    from anthropic import Anthropic, DefaultHttpxClient
+
+    # The SDK's own httpx wrapper rather than a raw httpx.Client, so the
+    # transport is typed for whatever httpx flavor the SDK is built against.
+    return Anthropic(
+        api_key=api_key,
+        base_url=api_base,
+        timeout=timeout,
+        max_retries=max_retries,
+        http_client=DefaultHttpxClient(
+            limits=httpx.Limits(
+                max_keepalive_connections=32,
+                max_connections=64,
+                keepalive_expiry=60.0,
+            ),
+            timeout=timeout,
+        ),
+    )
+
+
+@lru_cache(maxsize=8)
+def _shared_async_client(
+    api_key: str | None,
+    api_base: str | None,
+    timeout: float,
+    max_retries: int,
+) -> AsyncAnthropic:
+    """Build (or reuse) the async client for an endpoint."""
+    import httpx
+    from anthropic import AsyncAnthropic, DefaultAsyncHttpxClient
+
+    return AsyncAnthropic(
+        api_key=api_key,
+        base_url=api_base,
+        timeout=timeout,
+        max_retries=max_retries,
+        http_client=DefaultAsyncHttpxClient(
+            limits=httpx.Limits(
+                max_keepalive_connections=32,
+                max_connections=64,
+                keepalive_expiry=60.0,
+            ),
+            timeout=timeout,
+        ),
+    )
+
+
+def reset_shared_clients() -> None:
+    """Forget the shared clients (test hook); new ones build on demand."""
+    _shared_sync_client.cache_clear()
+    _shared_async_client.cache_clear()
+
 
 class BaseClaudeLLM(ABC):
     """The Base Claude LLM implementation."""
 
+    # Slots instead of a per-instance __dict__: wrappers are created per LLM
+    # binding and their attributes sit on the request-preparation hot path.
+    __slots__ = ("_async_client", "_sync_client")
+
     _async_client: AsyncAnthropic
     _sync_client: Anthropic
 
@@ -86,6 +164,18 @@ class BaseClaudeLLM(ABC):
 class ClaudeLLMImpl(BaseClaudeLLM):
     """Orchestration Claude LLM Implementation."""
 
+    __slots__ = (
+        "api_key",
+        "api_base",
+        "api_version",
+        "api_type",
+        "organization",
+        "max_retries",
+        "request_timeout",
+        "reporter",
+    )
+
+    # Class-level default, deliberately not a slot.
     _reporter: StatusReporter = ConsoleStatusReporter()
 
     def __init__(
@@ -119,20 +209,17 @@ class ClaudeLLMImpl(BaseClaudeLLM):
             raise
 
     def _create_claude_client(self):
-        """Create a new Anthropic client instance."""
-        sync_client = Anthropic(
-            api_key=self.api_key,
-            base_url=self.api_base,
-            # Retry Configuration
-            timeout=self.request_timeout,
-            max_retries=self.max_retries,
+        """Resolve the shared Anthropic client instances for this endpoint."""
+        sync_client = _shared_sync_client(
+            self.api_key,
+            self.api_base,
+            self.request_timeout,
+            self.max_retries,
         )
-
-        async_client = AsyncAnthropic(
-            api_key=self.api_key,
-            base_url=self.api_base,
-            # Retry Configuration
-            timeout=self.request_timeout,
-            max_retries=self.max_retries,
+        async_client = _shared_async_client(
+            self.api_key,
+            self.api_base,
+            self.request_timeout,
+            self.max_retries,
         )
         self.set_clients(sync_client=sync_client, async_client=async_client)
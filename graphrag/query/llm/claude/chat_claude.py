@@ -14,6 +14,7 @@ from tenacity import (
     wait_exponential_jitter,
 )
 
+from graphrag.llm.claude.utils import partition_system
 from graphrag.query.llm.base import BaseLLM, BaseLLMCallback
 from graphrag.query.llm.claude.base import ClaudeLLMImpl
 from graphrag.query.llm.claude.typing import (
@@ -25,6 +26,46 @@ from graphrag.query.progress import StatusReporter
 _MODEL_REQUIRED_MSG = "model is required"
 
 
+def _apply_prompt_caching(
+    messages: list[Any], kwargs: dict[str, Any]
+) -> list[Any]:
+    """Mark the system prompt and newest user turn with ephemeral cache_control.
+
+    Anthropic allows at most 4 cache_control blocks per request; marking just
+    these two keeps repeated calls on the cached prefix. Returns a new list
+    rather than rewriting in place: when no system message was present the
+    caller's original list reaches here, and it must not be mutated.
+    """
+    system = kwargs.get("system")
+    if isinstance(system, str):
+        kwargs["system"] = [
+            {
+                "type": "text",
+                "text": system,
+                "cache_control": {"type": "ephemeral"},
+            }
+        ]
+    if (
+        messages
+        and messages[-1].get("role") == "user"
+        and isinstance(messages[-1].get("content"), str)
+    ):
+        messages = [
+            *messages[:-1],
+            {
+                "role": "user",
+                "content": [
+                    {
+                        "type": "text",
+                        "text": messages[-1]["content"],
+                        "cache_control": {"type": "ephemeral"},
+                    }
+                ],
+            },
+        ]
+    return messages
+
+
 class ChatClaude(BaseLLM, ClaudeLLMImpl):
     """Wrapper for Anthropic ChatCompletion models."""
 
@@ -40,6 +81,7 @@ class ChatClaude(BaseLLM, ClaudeLLMImpl):
         request_timeout: float = 180.0,
         retry_error_types: tuple[type[BaseException]] = CLAUDE_RETRY_ERROR_TYPES,  # type: ignore
         reporter: StatusReporter | None = None,
+        prompt_caching_enabled: bool = False,
     ):
         ClaudeLLMImpl.__init__(
             self=self,
@@ -54,6 +96,7 @@ class ChatClaude(BaseLLM, ClaudeLLMImpl):
         )
         self.model = model
         self.retry_error_types = retry_error_types
+        self.prompt_caching_enabled = prompt_caching_enabled
 
     def generate(
         self,
@@ -66,15 +109,10 @@ class ChatClaude(BaseLLM, ClaudeLLMImpl):
 
         # Extract system message if present
         system_message = None
-        filtered_messages = []
-        if not isinstance(messages, str):
-            for message in messages:
-                if message.get('role') == 'system':
-                    system_message = message.get('content')
-                else:
-                    filtered_messages.append(message)
-
-        messages = filtered_messages
+        if isinstance(messages, str):
+            messages = []
+        else:
+            system_message, messages = partition_system(messages)
 
         # go for max tokens
         kwargs['extra_headers'] = {"anthropic-beta": "max-tokens-3-5-sonnet-2024-07-15"}
@@ -83,6 +121,9 @@ class ChatClaude(BaseLLM, ClaudeLLMImpl):
         if system_message:
             kwargs['system'] = system_message
 
+        if self.prompt_caching_enabled:
+            messages = _apply_prompt_caching(messages, kwargs)
+
         try:
             retryer = Retrying(
                 stop=stop_after_attempt(self.max_retries),
@@ -118,15 +159,10 @@ class ChatClaude(BaseLLM, ClaudeLLMImpl):
 
         # Extract system message if present
         system_message = None
-        filtered_messages = []
-        if not isinstance(messages, str):
-            for message in messages:
-                if message.get('role') == 'system':
-                    system_message = message.get('content')
-                else:
-                    filtered_messages.append(message)
-
-        messages = filtered_messages
+        if isinstance(messages, str):
+            messages = []
+        else:
+            system_message, messages = partition_system(messages)
 
         # go for max tokens
         kwargs['extra_headers'] = {"anthropic-beta": "max-tokens-3-5-sonnet-2024-07-15"}
@@ -134,7 +170,10 @@ class ChatClaude(BaseLLM, ClaudeLLMImpl):
         # Add system message to args if found
         if system_message:
             kwargs['system'] = system_message
-            
+
+        if self.prompt_caching_enabled:
+            messages = _apply_prompt_caching(messages, kwargs)
+
         try:
             retryer = AsyncRetrying(
                 stop=stop_after_attempt(self.max_retries),
@@ -169,27 +208,33 @@ class ChatClaude(BaseLLM, ClaudeLLMImpl):
             raise ValueError(_MODEL_REQUIRED_MSG)
 
         if streaming:
-            full_response = ""
+            # Accumulate in a list: += on a str is O(n^2) over a long stream.
+            parts: list[str] = []
             with self.sync_client.messages.stream(
                 messages=messages,
                 model=model,
                 **kwargs,
             ) as stream:
                 for text in stream.text_stream:
-                    full_response += text
+                    parts.append(text)
                     if callbacks:
                         for callback in callbacks:
-                            callback.on_llm_new_token(delta)
-            return full_response
+                            callback.on_llm_new_token(text)
+            return "".join(parts)
 
         else:
             response = self.sync_client.messages.create(
                 model=model,
                 messages=messages,
-                stream=streaming,
                 **kwargs,
-            ) 
-            return response.content[0].text
+            )
+            # Join all text blocks: indexing [0] dropped any text after the
+            # first block on tool-use augmented responses.
+            return "".join(
+                block.text
+                for block in response.content
+                if getattr(block, "type", None) == "text"
+            )
 
     async def _agenerate(
         self,
@@ -203,24 +248,30 @@ class ChatClaude(BaseLLM, ClaudeLLMImpl):
             raise ValueError(_MODEL_REQUIRED_MSG)
 
         if streaming:
-            full_response = ""
+            # Accumulate in a list: += on a str is O(n^2) over a long stream.
+            parts: list[str] = []
             async with self.async_client.messages.stream(
                 messages=messages,
                 model=model,
                 **kwargs,
             ) as stream:
                 async for text in stream.text_stream:
-                    full_response += text
+                    parts.append(text)
                     if callbacks:
                         for callback in callbacks:
-                            callback.on_llm_new_token(delta)
-            return full_response
+                            callback.on_llm_new_token(text)
+            return "".join(parts)
 
         else:
             response = await self.async_client.messages.create(
                 model=model,
                 messages=messages,
-                stream=streaming,
                 **kwargs,
-            ) 
-            return response.content[0].text
+            )
+            # Join all text blocks: indexing [0] dropped any text after the
+            # first block on tool-use augmented responses.
+            return "".join(
+                block.text
+                for block in response.content
+                if getattr(block, "type", None) == "text"
+            )
@@ -2,31 +2,179 @@
 
 """Anthropic Wrappers for Orchestration."""
 
+import asyncio
+import hashlib
+import json
 import logging
+import random
+import socket
+import threading
+import time
+from collections.abc import Awaitable, AsyncIterator, Callable, Iterator
 from typing import Any
-
-from tenacity import (
-    AsyncRetrying,
-    RetryError,
-    Retrying,
-    retry_if_exception_type,
-    stop_after_attempt,
-    wait_exponential_jitter,
-)
+from urllib.parse import urlparse
 
 from graphrag.query.llm.base import BaseLLMCallback
 from graphrag.query.llm.claude.base import ClaudeLLMImpl
 from graphrag.query.llm.claude.typing import (
     CLAUDE_RETRY_ERROR_TYPES,
+    CLAUDE_RETRY_POLICY,
+    RETRYABLE_STATUS_CODES,
     ClaudeApiType,
 )
 
 log = logging.getLogger(__name__)
 
+try:
+    import orjson
+
+    def _dumps_key(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS, default=repr)
+
+except ImportError:
+    # orjson (C, several times faster than stdlib) is optional.
+    def _dumps_key(obj: Any) -> bytes:
+        return json.dumps(obj, sort_keys=True, default=repr).encode()
+
+
+# Rough character proxy for Anthropic's 1024-token prompt-cache minimum;
+# shorter system prompts are not cacheable and are sent as plain strings.
+_CACHEABLE_SYSTEM_MIN_CHARS = 1024
+
+
+try:
+    # Prefer the mypyc-compiled request-prep helpers when an installation
+    # has built them; the pure-Python module is the canonical fallback.
+    from ._prep_compiled import split_system as _split_system  # type: ignore
+except ImportError:
+    from ._prep import split_system as _split_system
+
+
+_DEFAULT_API_HOST = "api.anthropic.com"
+
+
+def _prewarm_dns(api_base: str | None) -> None:
+    """Prime the OS resolver cache for the API host, best effort.
+
+    Construction happens at application startup where a few milliseconds
+    are free; resolving here means the first generate() call doesn't pay
+    DNS lookup on its time-to-first-token.
+    """
+    try:
+        host = urlparse(api_base).hostname if api_base else _DEFAULT_API_HOST
+        if host:
+            socket.getaddrinfo(host, 443)
+    except Exception:  # noqa: BLE001 - prewarm must never break construction
+        pass
+
+
+def _normalize_messages(messages: str | list[Any]) -> list[Any]:
+    """Wrap a bare prompt string in the single user turn the API expects.
+
+    Done once here instead of leaving it to the SDK, which only wraps after
+    running the string through validation; downstream code (cache keys, the
+    create call) then always sees the canonical list form.
+    """
+    if isinstance(messages, str):
+        return [{"role": "user", "content": messages}]
+    return messages
+
+
+def _log_cache_usage(response: Any) -> None:
+    """Log prompt-cache telemetry from a non-streaming response."""
+    usage = getattr(response, "usage", None)
+    if usage is not None and log.isEnabledFor(logging.DEBUG):
+        log.debug(
+            "prompt cache usage: read=%s created=%s",
+            getattr(usage, "cache_read_input_tokens", None),
+            getattr(usage, "cache_creation_input_tokens", None),
+        )
+
+
+def _make_key(model: str, messages: str | list[Any], kwargs: dict) -> str:
+    """Build a stable cache key over the request-defining inputs."""
+    payload = _dumps_key((
+        model,
+        messages,
+        {
+            k: v
+            for k, v in kwargs.items()
+            if k != "stream"
+            and isinstance(v, (str, int, float, bool, list, dict, type(None)))
+        },
+    ))
+    return hashlib.blake2b(payload).hexdigest()
+
+
+class TTLResponseCache:
+    """An exact-match response cache with per-entry expiry.
+
+    Small and hand-rolled so it adds no dependency: a dict of
+    key -> (expiry, response) with insertion-order eviction once full.
+    The lock only guards dict operations, so it is never held across I/O.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self._maxsize = maxsize
+        self._entries: dict[str, tuple[float, str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> str | None:
+        """Get a live cached response, dropping it if expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.time():
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        """Store a response, evicting the oldest entry when full."""
+        with self._lock:
+            if key not in self._entries and len(self._entries) >= self._maxsize:
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = (time.time() + ttl, value)
+
+
+
+def _retry_sleep_seconds(exc: BaseException, attempt: int, cap: float) -> float:
+    """Compute the backoff before a retry, honoring Retry-After.
+
+    Rate-limit responses say exactly when quota recovers; sleeping that long
+    neither wastes an attempt by retrying early nor over-waits past recovery.
+    Other errors fall back to exponential backoff with jitter, bounded by
+    the error class's cap.
+    """
+    response = getattr(exc, "response", None)
+    if response is not None:
+        retry_after = response.headers.get("retry-after")
+        if retry_after:
+            try:
+                return min(cap, float(retry_after))
+            except ValueError:
+                pass
+    return min(cap, (2**attempt) + random.random())
+
+
 
 class Claude(ClaudeLLMImpl):
     """Wrapper for Anthropic Completion models."""
 
+    __slots__ = (
+        "model",
+        "max_concurrency",
+        "enable_prompt_cache",
+        "response_cache",
+        "cache_ttl",
+        "retry_error_types",
+        "retry_policy",
+        "_last_messages",
+        "_last_split",
+    )
+
     def __init__(
         self,
         api_key: str,
@@ -36,16 +184,162 @@ class Claude(ClaudeLLMImpl):
         api_type: ClaudeApiType = ClaudeApiType.Anthropic,
         organization: str | None = None,
         max_retries: int = 10,
+        request_timeout: float = 180.0,
+        max_concurrency: int = 8,
+        enable_prompt_cache: bool = True,
+        response_cache: TTLResponseCache | None = None,
+        cache_ttl: float = 300.0,
         retry_error_types: tuple[type[BaseException]] = CLAUDE_RETRY_ERROR_TYPES,  # type: ignore
+        retry_policy: dict[type[BaseException], tuple[int, float]] | None = None,
     ):
-        self.api_key = api_key
         self.model = model
-        self.api_base = api_base
-        self.api_version = api_version
-        self.api_type = api_type
-        self.organization = organization
-        self.max_retries = max_retries
+        self.max_concurrency = max_concurrency
+        self.enable_prompt_cache = enable_prompt_cache
+        self.response_cache = response_cache
+        self.cache_ttl = cache_ttl
         self.retry_error_types = retry_error_types
+        self.retry_policy = retry_policy or CLAUDE_RETRY_POLICY
+        # Single-slot memo for _split_system (see _split_system_cached).
+        self._last_messages: Any = None
+        self._last_split: tuple[str | None, str | list[Any]] | None = None
+        # The base constructor records the endpoint settings and resolves the
+        # shared clients; without this call the wrapper had no clients at all.
+        super().__init__(
+            api_key=api_key,
+            api_base=api_base,
+            api_version=api_version,
+            api_type=api_type,
+            organization=organization,
+            max_retries=max_retries,
+            request_timeout=request_timeout,
+        )
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            _prewarm_dns(self.api_base)
+        else:
+            # Don't block a live event loop on the synchronous resolver.
+            loop.run_in_executor(None, _prewarm_dns, self.api_base)
+
+    def _system_param(self, system_message: str) -> str | list[dict]:
+        """Build the system parameter, marking large prompts cacheable.
+
+        GraphRAG system prompts (rules plus retrieved context) are large and
+        reused across queries, so marking them with an ephemeral
+        cache_control block lets the API serve repeat calls from its prompt
+        cache instead of re-prefilling.
+        """
+        if (
+            self.enable_prompt_cache
+            and len(system_message) >= _CACHEABLE_SYSTEM_MIN_CHARS
+        ):
+            return [
+                {
+                    "type": "text",
+                    "text": system_message,
+                    "cache_control": {"type": "ephemeral"},
+                }
+            ]
+        return system_message
+
+    def _cache_key(self, messages: str | list[Any], kwargs: dict) -> str | None:
+        """Compute the response-cache key, or None when caching is off.
+
+        Sampled generations are never cached - serving a pinned response
+        would silently change their semantics. Only an explicit
+        temperature == 0 counts as deterministic: when the caller passes
+        nothing, the API samples at its default temperature of 1.0.
+        """
+        if self.response_cache is None:
+            return None
+        if kwargs.get("temperature") != 0:
+            return None
+        return _make_key(self.model, messages, kwargs)
+
+    def _split_system_cached(
+        self, messages: str | list[Any]
+    ) -> tuple[str | None, str | list[Any]]:
+        """Split the system message, memoizing the last input object.
+
+        Loop-heavy callers re-pass the same messages list across calls;
+        when the same object comes back the previous scan-and-filter result
+        is reused outright. A single slot holding a real reference (not a
+        bare id(), which can be reused once the original is collected) is
+        enough, and assumes callers don't mutate a list between calls.
+        """
+        if messages is self._last_messages:
+            return self._last_split  # type: ignore[return-value]
+        split = _split_system(messages)
+        self._last_messages = messages
+        self._last_split = split
+        return split
+
+    def _retry_budget(self, exc: BaseException) -> tuple[int, float]:
+        """Look up (max attempts, backoff cap) for an error, walking its MRO.
+
+        The MRO walk lets a policy entry for APIConnectionError also cover
+        its subclasses unless they have their own entry. Errors outside the
+        policy fall back to the uniform max_retries / 10s cap.
+        """
+        for cls in type(exc).__mro__:
+            budget = self.retry_policy.get(cls)
+            if budget is not None:
+                return budget
+        return self.max_retries, 10.0
+
+    def _should_retry(self, exc: BaseException) -> bool:
+        """Whether an error is transient and worth another attempt."""
+        return isinstance(exc, self.retry_error_types) or (
+            getattr(exc, "status_code", None) in RETRYABLE_STATUS_CODES
+        )
+
+    def _prep(
+        self, messages: str | list[Any], kwargs: dict
+    ) -> tuple[list[Any], dict]:
+        """Extract the system message and normalize messages for a request."""
+        system_message, messages = self._split_system_cached(messages)
+        if system_message is not None:
+            kwargs['system'] = self._system_param(system_message)
+        return _normalize_messages(messages), kwargs
+
+    def _retry_sync(self, attempt_fn: Callable[[], str], operation: str) -> str:
+        """Run an attempt under the per-error-class retry policy.
+
+        A plain loop instead of tenacity: the Retrying iterator plus the
+        per-attempt context manager cost allocations and a try/except on
+        the success path, which is the overwhelmingly common one.
+        """
+        attempt = 0
+        while True:
+            try:
+                return attempt_fn()
+            except Exception as e:
+                if not self._should_retry(e):
+                    raise
+                max_attempts, cap = self._retry_budget(e)
+                attempt += 1
+                if attempt >= max_attempts:
+                    log.exception("Retries exhausted at %s()", operation)
+                    return ""
+                time.sleep(_retry_sleep_seconds(e, attempt - 1, cap))
+
+    async def _retry_async(
+        self, attempt_fn: Callable[[], Awaitable[str]], operation: str
+    ) -> str:
+        """Async counterpart of _retry_sync."""
+        attempt = 0
+        while True:
+            try:
+                return await attempt_fn()
+            except Exception as e:
+                if not self._should_retry(e):
+                    raise
+                max_attempts, cap = self._retry_budget(e)
+                attempt += 1
+                if attempt >= max_attempts:
+                    log.exception("Retries exhausted at %s()", operation)
+                    return ""
+                await asyncio.sleep(_retry_sleep_seconds(e, attempt - 1, cap))
 
     def generate(
         self,
@@ -55,44 +349,16 @@ class Claude(ClaudeLLMImpl):
         **kwargs: Any,
     ) -> str:
         """Generate text."""
-
-        # Extract system message if present
-        system_message = None
-        filtered_messages = []
-        if not isinstance(messages, str):
-            for message in messages:
-                if message.get('role') == 'system':
-                    system_message = message.get('content')
-                else:
-                    filtered_messages.append(message)
-
-        messages = filtered_messages
-
-        # Add system message to args if found
-        if system_message:
-            kwargs['system'] = system_message
-
-        try:
-            retryer = Retrying(
-                stop=stop_after_attempt(self.max_retries),
-                wait=wait_exponential_jitter(max=10),
-                reraise=True,
-                retry=retry_if_exception_type(self.retry_error_types),
-            )
-            for attempt in retryer:
-                with attempt:
-                    return self._generate(
-                        messages=messages,
-                        streaming=streaming,
-                        callbacks=callbacks,
-                        **kwargs,
-                    )
-        except RetryError:
-            log.exception("RetryError at generate(): %s")
-            return ""
-        else:
-            # TODO: why not just throw in this case?
-            return ""
+        messages, kwargs = self._prep(messages, kwargs)
+        return self._retry_sync(
+            lambda: self._generate(
+                messages=messages,
+                streaming=streaming,
+                callbacks=callbacks,
+                **kwargs,
+            ),
+            "generate",
+        )
 
     async def agenerate(
         self,
@@ -102,44 +368,100 @@ class Claude(ClaudeLLMImpl):
         **kwargs: Any,
     ) -> str:
         """Generate Text Asynchronously."""
+        messages, kwargs = self._prep(messages, kwargs)
+        return await self._retry_async(
+            lambda: self._agenerate(
+                messages=messages,
+                streaming=streaming,
+                callbacks=callbacks,
+                **kwargs,
+            ),
+            "agenerate",
+        )
 
-        # Extract system message if present
-        system_message = None
-        filtered_messages = []
-        if not isinstance(messages, str):
-            for message in messages:
-                if message.get('role') == 'system':
-                    system_message = message.get('content')
-                else:
-                    filtered_messages.append(message)
-
-        messages = filtered_messages
-
-        # Add system message to args if found
-        if system_message:
-            kwargs['system'] = system_message
-            
-        try:
-            retryer = AsyncRetrying(
-                stop=stop_after_attempt(self.max_retries),
-                wait=wait_exponential_jitter(max=10),
-                reraise=True,
-                retry=retry_if_exception_type(self.retry_error_types),
-            )
-            async for attempt in retryer:
-                with attempt:
-                    return await self._agenerate(
-                        messages=messages,
-                        streaming=streaming,
-                        callbacks=callbacks,
-                        **kwargs,
-                    )
-        except RetryError:
-            log.exception("Error at agenerate()")
-            return ""
-        else:
-            # TODO: why not just throw in this case?
-            return ""
+    async def abatch(
+        self,
+        messages_list: list[str | list[Any]],
+        max_concurrency: int | None = None,
+        **kwargs: Any,
+    ) -> list[str | BaseException]:
+        """Generate text for many message lists with bounded concurrency.
+
+        A semaphore keeps the fan-out at max_concurrency in-flight requests
+        (tune to the Anthropic tier), which saturates request concurrency
+        without tripping rate limits. Results are returned in input order;
+        a request that still fails after retries yields its exception in
+        place rather than cancelling the rest of the batch.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or self.max_concurrency)
+
+        async def generate_one(messages: str | list[Any]) -> str:
+            async with semaphore:
+                return await self.agenerate(messages, streaming=False, **kwargs)
+
+        return await asyncio.gather(
+            *(generate_one(messages) for messages in messages_list),
+            return_exceptions=True,
+        )
+
+    def stream(
+        self,
+        messages: str | list[Any],
+        callbacks: list[BaseLLMCallback] | None = None,
+        **kwargs: Any,
+    ) -> Iterator[str]:
+        """Stream text, yielding each token as it arrives.
+
+        Unlike generate(streaming=True), which buffers the whole response
+        before returning, this hands tokens to the caller at network pace.
+        """
+        messages, kwargs = self._prep(messages, kwargs)
+
+        emit = (
+            [callback.on_llm_new_token for callback in callbacks]
+            if callbacks
+            else None
+        )
+        with self.sync_client.messages.stream(
+            messages=messages,
+            model=self.model,
+            **kwargs,
+        ) as stream:
+            for text in stream.text_stream:
+                if emit is not None:
+                    for fn in emit:
+                        fn(text)
+                yield text
+
+    async def astream(
+        self,
+        messages: str | list[Any],
+        callbacks: list[BaseLLMCallback] | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[str]:
+        """Stream text asynchronously, yielding each token as it arrives.
+
+        Suitable for passing straight through to SSE/WebSocket responses:
+        consumers see the first token after TTFT instead of after the full
+        response has been buffered.
+        """
+        messages, kwargs = self._prep(messages, kwargs)
+
+        emit = (
+            [callback.on_llm_new_token for callback in callbacks]
+            if callbacks
+            else None
+        )
+        async with self.async_client.messages.stream(
+            messages=messages,
+            model=self.model,
+            **kwargs,
+        ) as stream:
+            async for text in stream.text_stream:
+                if emit is not None:
+                    for fn in emit:
+                        fn(text)
+                yield text
 
     def _generate(
         self,
@@ -152,28 +474,56 @@ class Claude(ClaudeLLMImpl):
         if not model:
             raise ValueError(_MODEL_REQUIRED_MSG)
 
+        cache_key = self._cache_key(messages, kwargs)
+        if cache_key is not None:
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                # Replay the response so streaming consumers see a token.
+                if callbacks:
+                    for callback in callbacks:
+                        callback.on_llm_new_token(cached)
+                return cached
+
         if streaming:
-            full_response = ""
+            # Bind the callback methods once; the loop body runs per token.
+            emit = (
+                [callback.on_llm_new_token for callback in callbacks]
+                if callbacks
+                else None
+            )
+            # Accumulate chunks and join once: += inside the loop recopies
+            # the whole response per token once callbacks hold a reference.
+            parts: list[str] = []
             with self.sync_client.messages.stream(
                 messages=messages,
                 model=model,
                 **kwargs,
             ) as stream:
                 for text in stream.text_stream:
-                    full_response += text
-                    if callbacks:
-                        for callback in callbacks:
-                            callback.on_llm_new_token(delta)
-            return full_response
+                    parts.append(text)
+                    if emit is not None:
+                        for fn in emit:
+                            fn(text)
+            full_response = "".join(parts)
 
         else:
             response = self.sync_client.messages.create(
                 model=model,
                 messages=messages,
-                stream=streaming,
                 **kwargs,
-            ) 
-            return response.content[0].text
+            )
+            _log_cache_usage(response)
+            # Join all text blocks: indexing [0] dropped any text after the
+            # first block on tool-use augmented responses.
+            full_response = "".join(
+                block.text
+                for block in response.content
+                if getattr(block, "type", None) == "text"
+            )
+
+        if cache_key is not None:
+            self.response_cache.set(cache_key, full_response, self.cache_ttl)
+        return full_response
 
     async def _agenerate(
         self,
@@ -186,25 +536,86 @@ class Claude(ClaudeLLMImpl):
         if not model:
             raise ValueError(_MODEL_REQUIRED_MSG)
 
+        cache_key = self._cache_key(messages, kwargs)
+        if cache_key is not None:
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                # Replay the response so streaming consumers see a token.
+                if callbacks:
+                    for callback in callbacks:
+                        callback.on_llm_new_token(cached)
+                return cached
+
         if streaming:
-            full_response = ""
-            async with self.async_client.messages.stream(
-                messages=messages,
-                model=model,
-                **kwargs,
-            ) as stream:
-                async for text in stream.text_stream:
-                    full_response += text
-                    if callbacks:
-                        for callback in callbacks:
-                            callback.on_llm_new_token(delta)
-            return full_response
+            # Bind the callback methods once; the loop body runs per token.
+            emit = (
+                [callback.on_llm_new_token for callback in callbacks]
+                if callbacks
+                else None
+            )
+            # Accumulate chunks and join once: += inside the loop recopies
+            # the whole response per token once callbacks hold a reference.
+            parts: list[str] = []
+            if emit is None:
+                async with self.async_client.messages.stream(
+                    messages=messages,
+                    model=model,
+                    **kwargs,
+                ) as stream:
+                    async for text in stream.text_stream:
+                        parts.append(text)
+            else:
+                # Fan tokens out to callbacks from a separate task fed by a
+                # bounded queue: a callback that does I/O then stalls the
+                # fan-out, not the network receive loop, so inter-token
+                # latency stays at line rate.
+                queue: asyncio.Queue[str | None] = asyncio.Queue(maxsize=64)
+
+                async def fan_out() -> None:
+                    while (token := await queue.get()) is not None:
+                        # A raising callback must not kill this task: with
+                        # the queue bounded, a dead consumer leaves the
+                        # producer (and its finally) blocked on put()
+                        # forever. Disable the offender and keep draining.
+                        for fn in list(emit):
+                            try:
+                                fn(token)
+                            except Exception:
+                                log.exception(
+                                    "streaming callback raised; disabling it"
+                                )
+                                emit.remove(fn)
+
+                consumer = asyncio.create_task(fan_out())
+                try:
+                    async with self.async_client.messages.stream(
+                        messages=messages,
+                        model=model,
+                        **kwargs,
+                    ) as stream:
+                        async for text in stream.text_stream:
+                            parts.append(text)
+                            await queue.put(text)
+                finally:
+                    await queue.put(None)
+                    await consumer
+            full_response = "".join(parts)
 
         else:
             response = await self.async_client.messages.create(
                 model=model,
                 messages=messages,
-                stream=streaming,
                 **kwargs,
-            ) 
-            return response.content[0].text
+            )
+            _log_cache_usage(response)
+            # Join all text blocks: indexing [0] dropped any text after the
+            # first block on tool-use augmented responses.
+            full_response = "".join(
+                block.text
+                for block in response.content
+                if getattr(block, "type", None) == "text"
+            )
+
+        if cache_key is not None:
+            self.response_cache.set(cache_key, full_response, self.cache_ttl)
+        return full_response
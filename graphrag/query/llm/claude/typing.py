@@ -3,15 +3,33 @@
 """Anthropic wrapper options."""
 
 from enum import Enum
-from typing import Any, cast
 
-import anthropic
+from anthropic import (
+    APIConnectionError,
+    APITimeoutError,
+    InternalServerError,
+    RateLimitError,
+)
 
-CLAUDE_RETRY_ERROR_TYPES = (
-    cast(Any, anthropic).RateLimitError,
-    cast(Any, anthropic).APIConnectionError,
+CLAUDE_RETRY_ERROR_TYPES: tuple[type[BaseException], ...] = (
+    RateLimitError,
+    APIConnectionError,
+    APITimeoutError,
+    InternalServerError,
 )
 
+# 5xx statuses worth retrying when surfaced as a bare APIStatusError.
+RETRYABLE_STATUS_CODES = frozenset({500, 502, 503, 504})
+
+# Per-error-class retry budgets as (max attempts, backoff cap seconds).
+# Rate limits are worth waiting out; a connection that won't open or a
+# timing-out endpoint is better failed fast than retried for minutes.
+CLAUDE_RETRY_POLICY: dict[type[BaseException], tuple[int, float]] = {
+    RateLimitError: (10, 30.0),
+    APIConnectionError: (3, 2.0),
+    APITimeoutError: (3, 2.0),
+}
+
 
 class ClaudeApiType(str, Enum):
     """The Anthropic Flavor."""
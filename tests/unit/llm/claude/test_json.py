@@ -0,0 +1,76 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+"""JSON cleanup and streaming-validation tests."""
+
+from graphrag.llm.claude._json import (
+    JsonPrefixValidator,
+    _escape_inner_quotes,
+    extract_json_object,
+    parse_or_repair,
+)
+
+
+def test_validator_accepts_a_clean_json_stream() -> None:
+    validator = JsonPrefixValidator()
+    for chunk in ['{"a": ', '[1, 2], ', '"b": "x}]"', "}"]:
+        assert validator.feed(chunk)
+
+
+def test_validator_accepts_a_fenced_stream() -> None:
+    validator = JsonPrefixValidator()
+    assert validator.feed('```json\n{"a": 1}\n```')
+
+
+def test_validator_tolerates_a_short_prose_preamble() -> None:
+    # extract_json_object salvages prose before the value, so the
+    # validator must let it through rather than forcing a retry.
+    validator = JsonPrefixValidator()
+    assert validator.feed("Here is the JSON you asked for: ")
+    assert validator.feed('{"a": 1}')
+
+
+def test_validator_rejects_a_bracket_free_essay() -> None:
+    validator = JsonPrefixValidator()
+    fed: list[str] = []
+    verdict = True
+    while verdict and len("".join(fed)) < 1000:
+        chunk = "more prose without any bracket "
+        fed.append(chunk)
+        verdict = validator.feed(chunk)
+    assert not verdict
+    # Once invalid, the validator stays invalid.
+    assert not validator.feed('{"a": 1}')
+
+
+def test_validator_aborts_on_trailing_garbage_with_value_intact() -> None:
+    validator = JsonPrefixValidator()
+    parts = ['{"a": 1}', " Hope that helps!"]
+    assert validator.feed(parts[0])
+    assert not validator.feed(parts[1])
+    # The abort is safe: everything collected up to it still parses.
+    _cleaned, obj = parse_or_repair(parts[0])
+    assert obj == {"a": 1}
+
+
+def test_validator_ignores_brackets_inside_strings() -> None:
+    validator = JsonPrefixValidator()
+    assert validator.feed('{"a": "}}]]{{ \\" still in string"}')
+
+
+def test_escape_inner_quotes() -> None:
+    fixed = _escape_inner_quotes('{"a": "say "hi" twice"}')
+    assert fixed == '{"a": "say \\"hi\\" twice"}'
+    # Already escaped quotes and clean values pass through untouched.
+    clean = '{"a": "no quotes", "b": "pre \\"escaped\\""}'
+    assert _escape_inner_quotes(clean) == clean
+
+
+def test_extract_json_object_salvages_surrounded_json() -> None:
+    assert extract_json_object('prefix {"a": 1} suffix') == {"a": 1}
+    assert extract_json_object("no json here at all") is None
+
+
+def test_parse_or_repair_returns_parsed_object() -> None:
+    cleaned, obj = parse_or_repair('```json\n{"a": 1}\n```')
+    assert obj == {"a": 1}
+    assert cleaned
@@ -0,0 +1,103 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+"""Single-flight LLM Tests."""
+
+import asyncio
+from typing import cast
+
+import pytest
+
+from graphrag.llm import CompletionLLM, LLMOutput
+from graphrag.llm.claude.single_flight_llm import SingleFlightLLM
+
+
+async def test_concurrent_duplicates_are_coalesced() -> None:
+    calls = 0
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def mock_responder(input: str, **kwargs: dict) -> LLMOutput:
+        nonlocal calls
+        calls += 1
+        started.set()
+        await release.wait()
+        return LLMOutput(output=f"response to [{input}]")
+
+    llm = SingleFlightLLM(cast(CompletionLLM, mock_responder))
+    leader = asyncio.create_task(llm("input 1"))
+    await started.wait()
+    waiter = asyncio.create_task(llm("input 1"))
+    await asyncio.sleep(0)
+    release.set()
+
+    results = await asyncio.gather(leader, waiter)
+    assert calls == 1
+    assert all(r.output == "response to [input 1]" for r in results)
+
+
+async def test_distinct_inputs_are_not_coalesced() -> None:
+    calls = 0
+
+    async def mock_responder(input: str, **kwargs: dict) -> LLMOutput:
+        nonlocal calls
+        calls += 1
+        return LLMOutput(output=f"response to [{input}]")
+
+    llm = SingleFlightLLM(cast(CompletionLLM, mock_responder))
+    await asyncio.gather(llm("input 1"), llm("input 2"))
+    assert calls == 2
+
+
+async def test_error_propagates_to_waiters() -> None:
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def throwing_responder(input: str, **kwargs: dict) -> LLMOutput:
+        started.set()
+        await release.wait()
+        raise ValueError
+
+    llm = SingleFlightLLM(cast(CompletionLLM, throwing_responder))
+    leader = asyncio.create_task(llm("input 1"))
+    await started.wait()
+    waiter = asyncio.create_task(llm("input 1"))
+    await asyncio.sleep(0)
+    release.set()
+
+    with pytest.raises(ValueError):
+        await leader
+    with pytest.raises(ValueError):
+        await waiter
+
+
+async def test_cancelled_leader_does_not_hang_waiters() -> None:
+    started = asyncio.Event()
+
+    async def hanging_responder(input: str, **kwargs: dict) -> LLMOutput:
+        started.set()
+        await asyncio.sleep(600)
+        return LLMOutput(output="never")
+
+    llm = SingleFlightLLM(cast(CompletionLLM, hanging_responder))
+    leader = asyncio.create_task(llm("input 1"))
+    await started.wait()
+    waiter = asyncio.create_task(llm("input 1"))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.wait_for(waiter, timeout=5)
+
+
+async def test_sequential_calls_hit_the_delegate_each_time() -> None:
+    calls = 0
+
+    async def mock_responder(input: str, **kwargs: dict) -> LLMOutput:
+        nonlocal calls
+        calls += 1
+        return LLMOutput(output=f"response to [{input}]")
+
+    llm = SingleFlightLLM(cast(CompletionLLM, mock_responder))
+    await llm("input 1")
+    await llm("input 1")
+    assert calls == 2
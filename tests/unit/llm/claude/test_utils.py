@@ -0,0 +1,42 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+"""Claude utility tests."""
+
+from graphrag.llm.claude.utils import fast_hash, partition_system
+
+
+def test_partition_system_extracts_the_first_system_message() -> None:
+    system_message, rest = partition_system([
+        {"role": "system", "content": "S1"},
+        {"role": "user", "content": "u"},
+        {"role": "assistant", "content": "a"},
+    ])
+    assert system_message == "S1"
+    assert rest == [
+        {"role": "user", "content": "u"},
+        {"role": "assistant", "content": "a"},
+    ]
+
+
+def test_partition_system_drops_every_system_entry() -> None:
+    # The messages API rejects system roles inside messages, so none may
+    # survive in the filtered list even when the first one already won.
+    system_message, rest = partition_system([
+        {"role": "system", "content": "S1"},
+        {"role": "user", "content": "u"},
+        {"role": "system", "content": "S2"},
+    ])
+    assert system_message == "S1"
+    assert rest == [{"role": "user", "content": "u"}]
+
+
+def test_partition_system_passes_through_when_absent() -> None:
+    messages = [{"role": "user", "content": "u"}]
+    system_message, rest = partition_system(messages)
+    assert system_message is None
+    assert rest is messages
+
+
+def test_fast_hash_is_deterministic_over_chunking() -> None:
+    assert fast_hash(b"ab", b"cd") == fast_hash(b"abcd")
+    assert fast_hash(b"ab") != fast_hash(b"cd")
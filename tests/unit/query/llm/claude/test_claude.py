@@ -0,0 +1,120 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+"""Claude query wrapper tests."""
+
+import time
+
+import pytest
+
+from graphrag.query.llm.claude.claude import Claude, TTLResponseCache
+
+
+def _make_llm(**kwargs) -> Claude:
+    return Claude(api_key="test-key", model="test-model", **kwargs)
+
+
+def test_ttl_cache_hit_and_miss() -> None:
+    cache = TTLResponseCache()
+    assert cache.get("k") is None
+    cache.set("k", "v", ttl=60.0)
+    assert cache.get("k") == "v"
+
+
+def test_ttl_cache_expires_entries() -> None:
+    cache = TTLResponseCache()
+    cache.set("k", "v", ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get("k") is None
+
+
+def test_ttl_cache_evicts_oldest_when_full() -> None:
+    cache = TTLResponseCache(maxsize=2)
+    cache.set("a", "1", ttl=60.0)
+    cache.set("b", "2", ttl=60.0)
+    cache.set("c", "3", ttl=60.0)
+    assert cache.get("a") is None
+    assert cache.get("b") == "2"
+    assert cache.get("c") == "3"
+
+
+def test_retry_budget_walks_the_mro() -> None:
+    class Transient(Exception):
+        pass
+
+    class MoreSpecific(Transient):
+        pass
+
+    llm = _make_llm(max_retries=7, retry_policy={Transient: (3, 2.0)})
+    # Subclasses inherit the parent's budget unless they have their own.
+    assert llm._retry_budget(Transient()) == (3, 2.0)
+    assert llm._retry_budget(MoreSpecific()) == (3, 2.0)
+    # Errors outside the policy fall back to the uniform budget.
+    assert llm._retry_budget(ValueError()) == (7, 10.0)
+
+
+def test_should_retry_honors_status_codes() -> None:
+    class StatusError(Exception):
+        def __init__(self, status_code: int):
+            self.status_code = status_code
+
+    llm = _make_llm(retry_error_types=())
+    assert llm._should_retry(StatusError(503))
+    assert not llm._should_retry(StatusError(404))
+    assert not llm._should_retry(ValueError())
+
+
+def test_retry_sync_returns_on_success() -> None:
+    llm = _make_llm()
+    assert llm._retry_sync(lambda: "ok", "generate") == "ok"
+
+
+def test_retry_sync_reraises_non_retryable_errors() -> None:
+    llm = _make_llm()
+    calls = 0
+
+    def attempt() -> str:
+        nonlocal calls
+        calls += 1
+        raise ValueError
+
+    with pytest.raises(ValueError):
+        llm._retry_sync(attempt, "generate")
+    assert calls == 1
+
+
+def test_retry_sync_exhausts_the_error_class_budget() -> None:
+    class Transient(Exception):
+        pass
+
+    llm = _make_llm(
+        retry_error_types=(Transient,),
+        retry_policy={Transient: (3, 0.0)},
+    )
+    calls = 0
+
+    def attempt() -> str:
+        nonlocal calls
+        calls += 1
+        raise Transient
+
+    assert llm._retry_sync(attempt, "generate") == ""
+    assert calls == 3
+
+
+async def test_retry_async_exhausts_the_error_class_budget() -> None:
+    class Transient(Exception):
+        pass
+
+    llm = _make_llm(
+        retry_error_types=(Transient,),
+        retry_policy={Transient: (2, 0.0)},
+    )
+    calls = 0
+
+    async def attempt() -> str:
+        nonlocal calls
+        calls += 1
+        raise Transient
+
+    assert await llm._retry_async(attempt, "agenerate") == ""
+    assert calls == 2